@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+Optional ctypes binding to OpenSSL's libcrypto for AES-128-CBC.
+
+PyCryptodome builds a fresh cipher object per call and pads/unpads in Python.
+Calling the EVP interface directly (EVP_EncryptInit_ex / EVP_EncryptUpdate /
+EVP_EncryptFinal_ex and the decrypt mirrors) hands the whole operation —
+including PKCS#7 padding — to OpenSSL in one pass. The binding is verified
+against a known test vector at import time; cbc_encrypt()/cbc_decrypt() fall
+back to PyCryptodome when libcrypto is unavailable.
+"""
+
+import ctypes
+import ctypes.util
+import hashlib
+from ctypes import (c_char_p, c_int, c_size_t, c_uint, c_void_p, byref,
+                    create_string_buffer)
+
+# AES-128-CBC of "Hi Bob!" under key 000102...0f with a zero IV (PKCS#7)
+_TEST_KEY = bytes(range(16))
+_TEST_IV = b'\x00' * 16
+_TEST_PLAINTEXT = b"Hi Bob!"
+_TEST_CIPHERTEXT = bytes.fromhex("da1630aa279f0f97ab69ca20ec80baa5")
+
+_BLOCK_SIZE = 16
+
+
+def _load_libcrypto():
+    """Load libcrypto and declare the EVP entry points we use."""
+    candidates = [ctypes.util.find_library('crypto'),
+                  'libcrypto.so.3', 'libcrypto.so.1.1']
+    for name in candidates:
+        if not name:
+            continue
+        try:
+            lib = ctypes.CDLL(name)
+        except OSError:
+            continue
+        if not hasattr(lib, 'EVP_CIPHER_CTX_new'):
+            continue
+        lib.EVP_CIPHER_CTX_new.restype = c_void_p
+        lib.EVP_CIPHER_CTX_new.argtypes = []
+        lib.EVP_CIPHER_CTX_free.restype = None
+        lib.EVP_CIPHER_CTX_free.argtypes = [c_void_p]
+        lib.EVP_aes_128_cbc.restype = c_void_p
+        lib.EVP_aes_128_cbc.argtypes = []
+        for init, update, final in (
+            ('EVP_EncryptInit_ex', 'EVP_EncryptUpdate', 'EVP_EncryptFinal_ex'),
+            ('EVP_DecryptInit_ex', 'EVP_DecryptUpdate', 'EVP_DecryptFinal_ex'),
+        ):
+            getattr(lib, init).restype = c_int
+            getattr(lib, init).argtypes = [c_void_p, c_void_p, c_void_p,
+                                           c_char_p, c_char_p]
+            getattr(lib, update).restype = c_int
+            getattr(lib, update).argtypes = [c_void_p, c_char_p,
+                                             ctypes.POINTER(c_int),
+                                             c_char_p, c_int]
+            getattr(lib, final).restype = c_int
+            getattr(lib, final).argtypes = [c_void_p, c_char_p,
+                                            ctypes.POINTER(c_int)]
+        lib.EVP_CipherInit_ex.restype = c_int
+        lib.EVP_CipherInit_ex.argtypes = [c_void_p, c_void_p, c_void_p,
+                                          c_char_p, c_void_p, c_int]
+        lib.EVP_aes_128_ecb.restype = c_void_p
+        lib.EVP_aes_128_ecb.argtypes = []
+        lib.EVP_CIPHER_CTX_set_padding.restype = c_int
+        lib.EVP_CIPHER_CTX_set_padding.argtypes = [c_void_p, c_int]
+        lib.EVP_sha256.restype = c_void_p
+        lib.EVP_sha256.argtypes = []
+        lib.EVP_Digest.restype = c_int
+        lib.EVP_Digest.argtypes = [c_char_p, c_size_t, c_char_p,
+                                   ctypes.POINTER(c_uint), c_void_p, c_void_p]
+        return lib
+    return None
+
+
+_lib = _load_libcrypto()
+
+# Contexts cached per (key, direction). Setting up an EVP context runs the
+# AES key schedule; re-initializing with NULL cipher/key and a fresh IV
+# keeps the schedule and only resets the chaining state, so repeated calls
+# under the same key (e.g. the generator-tamper candidate loop) pay for the
+# key schedule once. Contexts live for the life of the process.
+_ctx_cache = {}
+
+# Scratch output buffer shared by the CBC paths, grown on demand; EVP does
+# the PKCS#7 padding directly into it, so a call allocates nothing beyond
+# the returned bytes.
+_out_buf = create_string_buffer(4096)
+
+
+def _scratch(size: int):
+    global _out_buf
+    if len(_out_buf) < size:
+        _out_buf = create_string_buffer(size)
+    return _out_buf
+
+
+# Pinned IV buffer for context resets: the IV bytes are copied into this
+# fixed 16-byte array so every EVP_CipherInit_ex reset hands OpenSSL the
+# same pointer instead of marshalling a fresh bytes object.
+_IV_BUF = (ctypes.c_ubyte * 16)() if _lib is not None else None
+
+
+def _get_ctx(key: bytes, iv: bytes, encrypt: bool):
+    """Return an initialized EVP context for key, reusing cached ones."""
+    init = _lib.EVP_EncryptInit_ex if encrypt else _lib.EVP_DecryptInit_ex
+    ctx = _ctx_cache.get((key, encrypt))
+    if ctx is None:
+        ctx = _lib.EVP_CIPHER_CTX_new()
+        if not init(ctx, _lib.EVP_aes_128_cbc(), None, key, iv):
+            _lib.EVP_CIPHER_CTX_free(ctx)
+            raise ValueError("EVP init failed")
+        _ctx_cache[(key, encrypt)] = ctx
+    else:
+        # IV-only reset via the pinned buffer: cipher, key and direction
+        # (enc = -1) stay as configured
+        ctypes.memmove(_IV_BUF, iv, _BLOCK_SIZE)
+        if not _lib.EVP_CipherInit_ex(ctx, None, None, None, _IV_BUF, -1):
+            raise ValueError("EVP re-init failed")
+    return ctx
+
+
+def _evp_cbc_encrypt(key: bytes, iv: bytes, plaintext: bytes) -> bytes:
+    """AES-128-CBC encrypt with PKCS#7 padding via EVP."""
+    ctx = _get_ctx(key, iv, encrypt=True)
+    out = _scratch(len(plaintext) + _BLOCK_SIZE)
+    outl = c_int(0)
+    if not _lib.EVP_EncryptUpdate(ctx, out, byref(outl),
+                                  plaintext, len(plaintext)):
+        raise ValueError("EVP_EncryptUpdate failed")
+    total = outl.value
+    finl = c_int(0)
+    if not _lib.EVP_EncryptFinal_ex(
+            ctx, ctypes.cast(ctypes.addressof(out) + total, c_char_p),
+            byref(finl)):
+        raise ValueError("EVP_EncryptFinal_ex failed")
+    return ctypes.string_at(out, total + finl.value)
+
+
+def _evp_cbc_decrypt(key: bytes, iv: bytes, ciphertext: bytes) -> bytes:
+    """AES-128-CBC decrypt via EVP; raises ValueError on bad padding."""
+    ctx = _get_ctx(key, iv, encrypt=False)
+    out = _scratch(len(ciphertext) + _BLOCK_SIZE)
+    outl = c_int(0)
+    if not _lib.EVP_DecryptUpdate(ctx, out, byref(outl),
+                                  ciphertext, len(ciphertext)):
+        raise ValueError("EVP_DecryptUpdate failed")
+    total = outl.value
+    finl = c_int(0)
+    if not _lib.EVP_DecryptFinal_ex(
+            ctx, ctypes.cast(ctypes.addressof(out) + total, c_char_p),
+            byref(finl)):
+        raise ValueError("Padding is incorrect.")
+    return ctypes.string_at(out, total + finl.value)
+
+
+def _evp_decrypt_block(key: bytes, block: bytes) -> bytes:
+    """Raw AES-128 decryption of one 16-byte block (ECB, no padding)."""
+    ctx = _ctx_cache.get((key, 'ecb'))
+    if ctx is None:
+        ctx = _lib.EVP_CIPHER_CTX_new()
+        if not _lib.EVP_DecryptInit_ex(ctx, _lib.EVP_aes_128_ecb(),
+                                       None, key, None):
+            _lib.EVP_CIPHER_CTX_free(ctx)
+            raise ValueError("EVP init failed")
+        _lib.EVP_CIPHER_CTX_set_padding(ctx, 0)
+        _ctx_cache[(key, 'ecb')] = ctx
+    out = _scratch(_BLOCK_SIZE)
+    outl = c_int(0)
+    if not _lib.EVP_DecryptUpdate(ctx, out, byref(outl), block, _BLOCK_SIZE):
+        raise ValueError("EVP_DecryptUpdate failed")
+    return ctypes.string_at(out, outl.value)
+
+
+def _evp_sha256_prefix16(buf: bytes) -> bytes:
+    """First 16 bytes of SHA-256(buf) via EVP's one-shot digest."""
+    out = create_string_buffer(32)
+    outl = c_uint(0)
+    if not _lib.EVP_Digest(buf, len(buf), out, byref(outl),
+                           _lib.EVP_sha256(), None):
+        raise ValueError("EVP_Digest failed")
+    return out.raw[:16]
+
+
+def _verify() -> bool:
+    """Check the binding against the test vector before trusting it."""
+    try:
+        ct = _evp_cbc_encrypt(_TEST_KEY, _TEST_IV, _TEST_PLAINTEXT)
+        pt = _evp_cbc_decrypt(_TEST_KEY, _TEST_IV, ct)
+        digest_ok = (_evp_sha256_prefix16(_TEST_PLAINTEXT) ==
+                     hashlib.sha256(_TEST_PLAINTEXT).digest()[:16])
+        return ct == _TEST_CIPHERTEXT and pt == _TEST_PLAINTEXT and digest_ok
+    except (ValueError, OSError):
+        return False
+
+
+# True when cbc_encrypt()/cbc_decrypt() go through the native EVP path
+available = _lib is not None and _verify()
+
+
+if available:
+    cbc_encrypt = _evp_cbc_encrypt
+    cbc_decrypt = _evp_cbc_decrypt
+    decrypt_block = _evp_decrypt_block
+    sha256_prefix16 = _evp_sha256_prefix16
+else:
+    from Crypto.Cipher import AES
+    from Crypto.Util.Padding import pad, unpad
+
+    def cbc_encrypt(key: bytes, iv: bytes, plaintext: bytes) -> bytes:
+        """AES-128-CBC encrypt with PKCS#7 padding via PyCryptodome."""
+        cipher = AES.new(key, AES.MODE_CBC, iv)
+        return cipher.encrypt(pad(plaintext, AES.block_size))
+
+    def cbc_decrypt(key: bytes, iv: bytes, ciphertext: bytes) -> bytes:
+        """AES-128-CBC decrypt via PyCryptodome; ValueError on bad padding."""
+        cipher = AES.new(key, AES.MODE_CBC, iv)
+        return unpad(cipher.decrypt(ciphertext), AES.block_size)
+
+    def decrypt_block(key: bytes, block: bytes) -> bytes:
+        """Raw AES-128 decryption of one 16-byte block via PyCryptodome."""
+        return AES.new(key, AES.MODE_ECB).decrypt(block)
+
+    def sha256_prefix16(buf: bytes) -> bytes:
+        """First 16 bytes of SHA-256(buf) via hashlib."""
+        return hashlib.sha256(buf).digest()[:16]
+
+
+if __name__ == "__main__":
+    print(f"libcrypto EVP available: {available}")
+    ct = cbc_encrypt(_TEST_KEY, _TEST_IV, _TEST_PLAINTEXT)
+    print(f"Test vector match: {ct == _TEST_CIPHERTEXT}")
+    print(f"Round trip: {cbc_decrypt(_TEST_KEY, _TEST_IV, ct) == _TEST_PLAINTEXT}")
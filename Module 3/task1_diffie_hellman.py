@@ -7,40 +7,310 @@ Emulates the full DH key exchange protocol between Alice and Bob.
 - Then with IETF 1024-bit parameters
 """
 
-import secrets
+import functools
+import hashlib
+import hmac
+import os
 from Crypto.Cipher import AES
-from Crypto.Hash import SHA256
-from Crypto.Util.Padding import pad, unpad
 
+try:
+    import gmpy2  # GMP-backed modexp (Montgomery reduction + assembly)
+except ImportError:
+    gmpy2 = None
 
-def int_to_bytes(n: int) -> bytes:
-    """Convert a non-negative integer to a big-endian byte string."""
-    if n == 0:
-        return b'\x00'
-    length = (n.bit_length() + 7) // 8
-    return n.to_bytes(length, byteorder='big')
+try:
+    import numba  # JIT for the small-group bulk-experiment path
+except ImportError:
+    numba = None
 
+try:
+    # OpenSSL EVP backend: picks up AES-NI automatically at runtime
+    from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+except ImportError:
+    Cipher = None
 
-def derive_key(shared_secret: int) -> bytes:
-    """Derive a 16-byte AES key from the shared secret using SHA-256."""
-    h = SHA256.new()
-    h.update(int_to_bytes(shared_secret))
-    return h.digest()[:16]  # truncate to 16 bytes for AES-128
+
+class MontCtx:
+    """
+    Montgomery-reduction context for a fixed odd modulus.
+
+    Precomputes R = 2^k (k = modulus bit-length), R^2 mod q and -q^-1 mod R
+    once, so every multiply inside an exponentiation replaces the division
+    by q with shifts and masks (REDC). Contexts are cached per modulus, so
+    the four exchange exponentiations over the IETF prime share one setup.
+    """
+
+    def __init__(self, mod: int):
+        if not mod & 1:
+            raise ValueError("Montgomery reduction requires an odd modulus")
+        self.mod = mod
+        self.shift = mod.bit_length()
+        self.mask = (1 << self.shift) - 1
+        self.one = (1 << self.shift) % mod          # R mod q (Montgomery 1)
+        self.r2 = (1 << (2 * self.shift)) % mod     # R^2 mod q
+        self.mod_inv = (-pow(mod, -1, 1 << self.shift)) & self.mask
+
+    def redc(self, t: int) -> int:
+        """Montgomery reduction: return t * R^-1 mod q for t < q*R."""
+        m = (t & self.mask) * self.mod_inv & self.mask
+        t = (t + m * self.mod) >> self.shift
+        return t - self.mod if t >= self.mod else t
+
+    def to_mont(self, x: int) -> int:
+        return self.redc(x % self.mod * self.r2)
+
+    def mul(self, x: int, y: int) -> int:
+        return self.redc(x * y)
+
+
+# Below this, per-multiply REDC does not pay for its own setup
+_MONT_MIN_BITS = 256
+
+_mont_cache = {}
+
+
+def _mont_ctx(mod: int) -> MontCtx:
+    ctx = _mont_cache.get(mod)
+    if ctx is None:
+        ctx = _mont_cache[mod] = MontCtx(mod)
+    return ctx
+
+
+def _window_size(exp_bits: int) -> int:
+    """Pick a sliding-window size adapted to the exponent bit-length."""
+    if exp_bits <= 8:
+        return 1
+    if exp_bits <= 32:
+        return 2
+    if exp_bits <= 128:
+        return 3
+    if exp_bits <= 512:
+        return 4
+    return 5  # ~1024-bit exponents
 
 
-def aes_cbc_encrypt(key: bytes, iv: bytes, plaintext: bytes) -> bytes:
-    """Encrypt plaintext with AES-CBC, applying PKCS7 padding."""
-    cipher = AES.new(key, AES.MODE_CBC, iv)
-    return cipher.encrypt(pad(plaintext, AES.block_size))
+@functools.lru_cache(maxsize=16)
+def _precompute_window(base: int, mod: int, k: int) -> tuple:
+    """
+    Odd-power table base^1, base^3, ..., base^(2^k - 1) in the working
+    domain (Montgomery form for large odd moduli). Cached so repeated
+    exponentiations with a shared base — Alice's and Bob's Y = a^X mod q —
+    pay the ~2^(k-1) setup multiplies only once.
+    """
+    if mod & 1 and mod.bit_length() >= _MONT_MIN_BITS:
+        ctx = _mont_ctx(mod)
+        mul = ctx.mul
+        base = ctx.to_mont(base)
+    else:
+        def mul(x, y):
+            return x * y % mod
+    base_sq = mul(base, base)
+    odd_powers = [base]
+    for _ in range((1 << (k - 1)) - 1):
+        odd_powers.append(mul(odd_powers[-1], base_sq))
+    return tuple(odd_powers)
+
+
+def modexp_sw(base: int, exp: int, mod: int) -> int:
+    """
+    Sliding-window modular exponentiation (left-to-right scan).
+
+    Precomputes the odd powers base^1, base^3, ..., base^(2^k - 1) mod `mod`,
+    then scans the exponent with a variable-length window, skipping runs of
+    zero bits with bare squarings. Cuts the number of big-integer multiplies
+    by ~20-30% versus square-and-multiply for 1024-bit exponents.
+    """
+    if mod == 1:
+        return 0
+    if exp < 0:
+        raise ValueError("negative exponents are not supported")
+    base %= mod
+    if exp == 0:
+        return 1
+
+    # Large odd moduli (the DH primes): work in Montgomery form so every
+    # multiply uses REDC instead of a bignum division.
+    ctx = None
+    if mod & 1 and mod.bit_length() >= _MONT_MIN_BITS:
+        ctx = _mont_ctx(mod)
+        mul = ctx.mul
+        result = ctx.one
+    else:
+        def mul(x, y):
+            return x * y % mod
+        result = 1
+
+    k = _window_size(exp.bit_length())
+    odd_powers = _precompute_window(base, mod, k)
+
+    i = exp.bit_length() - 1
+    while i >= 0:
+        if not (exp >> i) & 1:
+            # Run of zeros: just square
+            result = mul(result, result)
+            i -= 1
+        else:
+            # Take the longest window of <= k bits ending in a set bit
+            j = max(i - k + 1, 0)
+            while not (exp >> j) & 1:
+                j += 1
+            window = (exp >> j) & ((1 << (i - j + 1)) - 1)
+            for _ in range(i - j + 1):
+                result = mul(result, result)
+            result = mul(result, odd_powers[window >> 1])
+            i = j - 1
+
+    return ctx.redc(result) if ctx is not None else result
+
+
+if gmpy2 is not None:
+    _mpz_cache = {}
+
+    def _mpz(n: int):
+        """Cache mpz conversions for operands reused across exponentiations."""
+        v = _mpz_cache.get(n)
+        if v is None:
+            v = _mpz_cache[n] = gmpy2.mpz(n)
+        return v
+
+    def _powmod(base: int, exp: int, mod: int) -> int:
+        """Modular exponentiation via GMP's mpn_powm (Montgomery REDC)."""
+        return int(gmpy2.powmod(_mpz(base), exp, _mpz(mod)))
+else:
+    def _powmod(base: int, exp: int, mod: int) -> int:
+        """Fallback modular exponentiation when gmpy2 is unavailable."""
+        return modexp_sw(base, exp, mod)
+
+
+if numba is not None:
+    @numba.njit(cache=True)
+    def _dh_small(q, a, X_A, X_B):
+        """
+        Whole small-group exchange (both public values and both shared
+        secrets) in one JIT-compiled kernel. Square-and-multiply is spelled
+        out because Numba has no 3-arg pow; restricted to moduli below 2^31
+        so the intermediate products fit in int64.
+        """
+        out = [0, 0, 0, 0]
+        bases = [a, a, 0, 0]
+        exps = [X_A, X_B, X_A, X_B]
+        for i in range(4):
+            base = bases[i] % q
+            exp = exps[i]
+            result = 1
+            while exp:
+                if exp & 1:
+                    result = result * base % q
+                base = base * base % q
+                exp >>= 1
+            out[i] = result
+            if i == 1:
+                bases[2] = out[1]  # s_alice = Y_B^X_A
+                bases[3] = out[0]  # s_bob   = Y_A^X_B
+        return out[0], out[1], out[2], out[3]
+else:
+    _dh_small = None
+
+# _dh_small only helps when the exchange itself is trivial — i.e. bulk runs
+_DH_SMALL_MAX_BITS = 31
+
+
+def _rand_below(n: int) -> int:
+    """
+    Uniform random integer in [0, n) via rejection sampling.
+
+    Draws n.bit_length() bits from the OS RNG in a single os.urandom call
+    and rejects out-of-range values (the BN_rand_range approach). For a
+    1024-bit modulus this is one syscall per attempt, versus
+    secrets.randbelow's bit-at-a-time masking loop; each attempt succeeds
+    with probability >= 1/2.
+    """
+    bits = n.bit_length()
+    nbytes = (bits + 7) // 8
+    excess = nbytes * 8 - bits
+    while True:
+        r = int.from_bytes(os.urandom(nbytes), 'big') >> excess
+        if r < n:
+            return r
+
 
+def int_to_bytes(n: int) -> bytes:
+    """Convert a non-negative integer to a big-endian byte string."""
+    # `or 1` folds the n == 0 case into the length computation (one byte)
+    return n.to_bytes((n.bit_length() + 7) // 8 or 1, byteorder='big')
 
-def aes_cbc_decrypt(key: bytes, iv: bytes, ciphertext: bytes) -> bytes:
-    """Decrypt ciphertext with AES-CBC, removing PKCS7 padding."""
-    cipher = AES.new(key, AES.MODE_CBC, iv)
-    return unpad(cipher.decrypt(ciphertext), AES.block_size)
 
+@functools.lru_cache(maxsize=None)
+def derive_key(shared_secret: int) -> bytes:
+    """
+    Derive a 16-byte AES key from the shared secret using SHA-256.
 
-def diffie_hellman_exchange(q: int, a: int, label: str = ""):
+    Memoized: repeated runs over the same shared secret (Alice and Bob both
+    derive from the same s) hash it only once.
+    """
+    # hashlib links OpenSSL, which dispatches to SHA-NI where available
+    return hashlib.sha256(int_to_bytes(shared_secret)).digest()[:16]
+
+
+def _pkcs7_pad(data: bytes) -> bytes:
+    """Append PKCS7 padding to a full 16-byte block boundary."""
+    padlen = 16 - (len(data) & 15)
+    return data + bytes((padlen,)) * padlen
+
+
+def _pkcs7_unpad(data: bytes) -> bytes:
+    """Strip and validate PKCS7 padding."""
+    padlen = data[-1] if data else 0
+    if not 1 <= padlen <= 16 or data[-padlen:] != bytes((padlen,)) * padlen:
+        raise ValueError("Invalid PKCS7 padding")
+    return data[:-padlen]
+
+
+if Cipher is not None:
+    @functools.lru_cache(maxsize=8)
+    def _cbc_cipher(key: bytes, iv: bytes):
+        """
+        One Cipher object per (key, iv) pair, shared by both directions.
+
+        Each encryptor()/decryptor() call gets a fresh EVP context, but the
+        algorithm/mode objects (and their key validation) are built once.
+        OpenSSL's CBC-decrypt path pipelines multiple AESDEC blocks per
+        update(); CBC encrypt is serial by construction.
+        """
+        return Cipher(algorithms.AES(key), modes.CBC(iv))
+
+    def aes_cbc_encrypt(key: bytes, iv: bytes, plaintext: bytes) -> bytes:
+        """Encrypt plaintext with AES-CBC, applying PKCS7 padding."""
+        encryptor = _cbc_cipher(key, iv).encryptor()
+        return encryptor.update(_pkcs7_pad(plaintext)) + encryptor.finalize()
+
+    def aes_cbc_decrypt(key: bytes, iv: bytes, ciphertext: bytes) -> bytes:
+        """Decrypt ciphertext with AES-CBC, removing PKCS7 padding."""
+        decryptor = _cbc_cipher(key, iv).decryptor()
+        return _pkcs7_unpad(decryptor.update(ciphertext) + decryptor.finalize())
+else:
+    def aes_cbc_encrypt(key: bytes, iv: bytes, plaintext: bytes) -> bytes:
+        """Encrypt plaintext with AES-CBC, applying PKCS7 padding."""
+        # Pad directly into a scratch bytearray and let PyCryptodome write
+        # the ciphertext into it (output=), avoiding the separate padded
+        # copy and the result allocation.
+        padlen = 16 - (len(plaintext) & 15)
+        buf = bytearray(len(plaintext) + padlen)
+        buf[:len(plaintext)] = plaintext
+        buf[len(plaintext):] = bytes((padlen,)) * padlen
+        cipher = AES.new(key, AES.MODE_CBC, iv, use_aesni=True)
+        cipher.encrypt(bytes(buf), output=buf)
+        return bytes(buf)
+
+    def aes_cbc_decrypt(key: bytes, iv: bytes, ciphertext: bytes) -> bytes:
+        """Decrypt ciphertext with AES-CBC, removing PKCS7 padding."""
+        cipher = AES.new(key, AES.MODE_CBC, iv, use_aesni=True)
+        buf = bytearray(len(ciphertext))
+        cipher.decrypt(ciphertext, output=buf)
+        return _pkcs7_unpad(bytes(buf))
+
+
+def diffie_hellman_exchange(q: int, a: int, label: str = "", verbose: bool = True):
     """
     Run the full Diffie-Hellman key exchange between Alice and Bob.
 
@@ -49,52 +319,60 @@ def diffie_hellman_exchange(q: int, a: int, label: str = ""):
     q : int  — the prime modulus
     a : int  — the generator
     label : str — descriptive label for output
+    verbose : bool — print the full trace; disable for bulk/timing runs,
+        since stringifying 1024-bit ints to decimal dominates wall time
     """
-    print("=" * 70)
-    print(f"  Diffie-Hellman Key Exchange — {label}")
-    print("=" * 70)
+    say = print if verbose else (lambda *args, **kwargs: None)
+    say("=" * 70)
+    say(f"  Diffie-Hellman Key Exchange — {label}")
+    say("=" * 70)
 
     # --- Public parameters ---
-    print(f"\nPublic parameters:")
-    print(f"  q = {q}")
-    print(f"  a = {a}")
+    say(f"\nPublic parameters:")
+    say(f"  q = {q}")
+    say(f"  a = {a}")
 
-    # --- Alice picks a random private key X_A ∈ {2, ..., q-2} ---
-    X_A = secrets.randbelow(q - 2) + 2  # range [2, q-1)
-    Y_A = pow(a, X_A, q)
+    # --- Alice and Bob pick random private keys X ∈ {2, ..., q-2} ---
+    X_A = _rand_below(q - 2) + 2  # range [2, q-1)
+    X_B = _rand_below(q - 2) + 2
 
-    print(f"\nAlice:")
-    print(f"  Private key  X_A = {X_A}")
-    print(f"  Public value Y_A = a^X_A mod q = {Y_A}")
-
-    # --- Bob picks a random private key X_B ∈ {2, ..., q-2} ---
-    X_B = secrets.randbelow(q - 2) + 2
-    Y_B = pow(a, X_B, q)
-
-    print(f"\nBob:")
-    print(f"  Private key  X_B = {X_B}")
-    print(f"  Public value Y_B = a^X_B mod q = {Y_B}")
-
-    # --- Exchange public values and compute shared secret ---
+    # --- Public values and shared secrets ---
     # Alice sends Y_A to Bob; Bob sends Y_B to Alice.
-    s_alice = pow(Y_B, X_A, q)
-    s_bob   = pow(Y_A, X_B, q)
-
-    print(f"\nShared secret computation:")
-    print(f"  Alice computes s = Y_B^X_A mod q = {s_alice}")
-    print(f"  Bob   computes s = Y_A^X_B mod q = {s_bob}")
-    assert s_alice == s_bob, "ERROR: shared secrets do not match!"
-    print(f"  ✓ Shared secrets match: s = {s_alice}")
+    if _dh_small is not None and q.bit_length() <= _DH_SMALL_MAX_BITS:
+        # Small-group experiments: all four exponentiations in one JIT kernel
+        Y_A, Y_B, s_alice, s_bob = _dh_small(q, a, X_A, X_B)
+    else:
+        Y_A = _powmod(a, X_A, q)
+        Y_B = _powmod(a, X_B, q)
+        s_alice = _powmod(Y_B, X_A, q)
+        s_bob   = _powmod(Y_A, X_B, q)
+
+    say(f"\nAlice:")
+    say(f"  Private key  X_A = {X_A}")
+    say(f"  Public value Y_A = a^X_A mod q = {Y_A}")
+
+    say(f"\nBob:")
+    say(f"  Private key  X_B = {X_B}")
+    say(f"  Public value Y_B = a^X_B mod q = {Y_B}")
+
+    say(f"\nShared secret computation:")
+    say(f"  Alice computes s = Y_B^X_A mod q = {s_alice}")
+    say(f"  Bob   computes s = Y_A^X_B mod q = {s_bob}")
+    if s_alice != s_bob:
+        raise RuntimeError("shared secrets do not match")
+    say(f"  ✓ Shared secrets match: s = {s_alice}")
 
     # --- Derive symmetric key ---
     k_alice = derive_key(s_alice)
     k_bob   = derive_key(s_bob)
 
-    print(f"\nDerived AES-128 key (SHA-256 truncated to 16 bytes):")
-    print(f"  Alice: k = {k_alice.hex()}")
-    print(f"  Bob:   k = {k_bob.hex()}")
-    assert k_alice == k_bob, "ERROR: derived keys do not match!"
-    print(f"  ✓ Keys match")
+    say(f"\nDerived AES-128 key (SHA-256 truncated to 16 bytes):")
+    say(f"  Alice: k = {k_alice.hex()}")
+    say(f"  Bob:   k = {k_bob.hex()}")
+    # Constant-time comparison; also survives python -O, unlike assert
+    if not hmac.compare_digest(k_alice, k_bob):
+        raise RuntimeError("derived keys do not match")
+    say(f"  ✓ Keys match")
 
     # --- Encrypted message exchange ---
     # Use a shared initialization vector (16 zero bytes for simplicity)
@@ -103,30 +381,32 @@ def diffie_hellman_exchange(q: int, a: int, label: str = ""):
     # Alice encrypts m0 = "Hi Bob!" and sends c0 to Bob
     m0 = b"Hi Bob!"
     c0 = aes_cbc_encrypt(k_alice, iv, m0)
-    print(f"\nAlice → Bob:")
-    print(f"  Plaintext  m0 = {m0.decode()}")
-    print(f"  Ciphertext c0 = {c0.hex()}")
+    say(f"\nAlice → Bob:")
+    say(f"  Plaintext  m0 = {m0.decode()}")
+    say(f"  Ciphertext c0 = {c0.hex()}")
 
     # Bob decrypts c0
     m0_dec = aes_cbc_decrypt(k_bob, iv, c0)
-    print(f"  Bob decrypts:  {m0_dec.decode()}")
-    assert m0_dec == m0, "ERROR: Bob failed to decrypt Alice's message!"
-    print(f"  ✓ Bob successfully decrypted Alice's message")
+    say(f"  Bob decrypts:  {m0_dec.decode()}")
+    if m0_dec != m0:
+        raise RuntimeError("Bob failed to decrypt Alice's message")
+    say(f"  ✓ Bob successfully decrypted Alice's message")
 
     # Bob encrypts m1 = "Hi Alice!" and sends c1 to Alice
     m1 = b"Hi Alice!"
     c1 = aes_cbc_encrypt(k_bob, iv, m1)
-    print(f"\nBob → Alice:")
-    print(f"  Plaintext  m1 = {m1.decode()}")
-    print(f"  Ciphertext c1 = {c1.hex()}")
+    say(f"\nBob → Alice:")
+    say(f"  Plaintext  m1 = {m1.decode()}")
+    say(f"  Ciphertext c1 = {c1.hex()}")
 
     # Alice decrypts c1
     m1_dec = aes_cbc_decrypt(k_alice, iv, c1)
-    print(f"  Alice decrypts: {m1_dec.decode()}")
-    assert m1_dec == m1, "ERROR: Alice failed to decrypt Bob's message!"
-    print(f"  ✓ Alice successfully decrypted Bob's message")
+    say(f"  Alice decrypts: {m1_dec.decode()}")
+    if m1_dec != m1:
+        raise RuntimeError("Alice failed to decrypt Bob's message")
+    say(f"  ✓ Alice successfully decrypted Bob's message")
 
-    print()
+    say()
 
 
 # ============================================================
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Optional ctypes binding to the system crypt library for bcrypt hashing.
+
+libxcrypt's crypt_rn() computes bcrypt ($2b$) hashes directly, skipping the
+per-call prefix validation and bytes allocation the `bcrypt` package performs
+around each hash. Not every libcrypt build supports $2b$ (glibc's historic
+libcrypt does not), so the binding is verified against the assignment's test
+vector at import time; hashpw() falls back to the bcrypt package when the
+native route is unavailable.
+
+A deeper per-salt optimization — snapshotting the Blowfish P/S state after
+salt-only setup and replaying only the password contribution per candidate —
+is not possible for bcrypt: EksBlowfish alternates ExpandKey(password) and
+ExpandKey(salt) inside the 2^cost loop, so every round depends on the
+candidate and there is no reusable checkpoint. The full key schedule must be
+run per candidate; the only savings available at this layer are the per-call
+overheads addressed above.
+"""
+
+import ctypes
+import ctypes.util
+
+import bcrypt as _bcrypt_pkg
+
+# Test vector from the assignment hints
+_TEST_PASSWORD = b"registrationsucks"
+_TEST_SETTING = b"$2b$08$J9FW66ZdPI2nrIMcOxFYI."
+_TEST_HASH = b"$2b$08$J9FW66ZdPI2nrIMcOxFYI.zKGJsUXmWLAYWsNmIANUy5JbSjfyLFu"
+
+# crypt_rn requires the output buffer to hold a full struct crypt_data and
+# returns NULL for anything smaller; sizeof(struct crypt_data) is 32768 in
+# libxcrypt
+_CRYPT_DATA_SIZE = 32768
+
+
+def _load_crypt_rn():
+    """Load crypt_rn from libcrypt and verify it handles $2b$ hashes."""
+    candidates = [ctypes.util.find_library('crypt'), 'libcrypt.so.2', 'libcrypt.so.1']
+    for name in candidates:
+        if not name:
+            continue
+        try:
+            lib = ctypes.CDLL(name)
+        except OSError:
+            continue
+        if not hasattr(lib, 'crypt_rn'):
+            continue
+        fn = lib.crypt_rn
+        fn.restype = ctypes.c_char_p
+        fn.argtypes = [ctypes.c_char_p, ctypes.c_char_p, ctypes.c_void_p, ctypes.c_int]
+        out = fn(_TEST_PASSWORD, _TEST_SETTING,
+                 ctypes.create_string_buffer(_CRYPT_DATA_SIZE), _CRYPT_DATA_SIZE)
+        if out == _TEST_HASH:
+            return fn
+    return None
+
+
+_crypt_rn = _load_crypt_rn()
+
+# True when hashpw() goes through the native crypt_rn path
+available = _crypt_rn is not None
+
+
+if available:
+    # One scratch buffer reused across calls: crypt_rn writes into caller
+    # memory, so the per-candidate loop never allocates. Sized to a full
+    # struct crypt_data, as crypt_rn demands. Workers are separate
+    # processes, each with its own copy.
+    _out_buf = ctypes.create_string_buffer(_CRYPT_DATA_SIZE)
+
+    def hashpw(password: bytes, setting: bytes) -> bytes:
+        """Hash password with the given bcrypt setting via crypt_rn."""
+        out = _crypt_rn(password, setting, _out_buf, _CRYPT_DATA_SIZE)
+        return out if out is not None else b''
+else:
+    hashpw = _bcrypt_pkg.hashpw
+
+
+if __name__ == "__main__":
+    print(f"crypt_rn available: {available}")
+    result = hashpw(_TEST_PASSWORD, _TEST_SETTING)
+    print(f"Test vector match: {result == _TEST_HASH}")
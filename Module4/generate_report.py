@@ -6,72 +6,276 @@ This script generates a PDF report with all code, explanations, and answers to q
 AI Citation: Claude (Anthropic) was used to assist with code generation and report writing.
 """
 
-from reportlab.lib import colors
-from reportlab.lib.pagesizes import letter
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import inch
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
-from reportlab.platypus import Preformatted, PageBreak, Image
-from reportlab.lib.enums import TA_LEFT, TA_CENTER, TA_JUSTIFY
+import csv
+import functools
+import io
 import os
+from pathlib import Path
+
+# reportlab pulls in a heavy import graph (~100+ submodules); its imports are
+# deferred to the functions that need them so importing this module as a
+# library stays cheap.
+
+# Checked once at import time rather than stat()ing on every build
+_HAS_COLLISION_PNG = os.path.exists('Module4/collision_analysis.png')
+
+
+
+# Static table content: actual cracking results plus the header rows for the
+# CSV-backed collision tables, built once instead of per create_report call.
+_CRACK_RESULTS = (
+    ('User', 'Workfactor', 'Password', 'Time'),
+    ('Bilbo', '8', 'welcome', '392.82s (6.5 min)'),
+    ('Gandalf', '8', 'wizard', '390.51s (6.5 min)'),
+    ('Thorin', '8', 'diamond', '377.49s (6.3 min)'),
+    ('Fili', '9', 'desire', '782.39s (13 min)'),
+    ('Kili', '9', 'ossify', '740.89s (12.3 min)'),
+    ('Balin', '10', 'hangout', '1557.72s (26 min)'),
+    ('Dwalin', '10', 'drossy', '1361.81s (22.7 min)'),
+    ('Oin', '10', 'ispaghul', '1436.17s (24 min)'),
+    ('Gloin', '11', 'oversave', '2896.63s (48 min)'),
+    ('Dori', '11', 'indoxylic', '2755.79s (46 min)'),
+    ('Nori', '11', 'swagsman', '2929.05s (49 min)'),
+    ('Ori', '12', 'airway', '5450.16s (1.5 hrs)'),
+    ('Bifur', '12', 'corrosible', '5727.11s (1.6 hrs)'),
+    ('Bofur', '12', 'libellate', '5837.28s (1.6 hrs)'),
+    ('Durin', '13', 'purrone', '14509.72s (4.0 hrs)'),
+)
+
+_COLLISION_HEADER = ['Digest Bits', 'Hashes Required', 'Expected (2^(n/2))', 'Time (s)']
+_COLLISION_EXAMPLES_HEADER = ['Bits', 'Truncated Hash', 'Message 1 (hex)', 'Message 2 (hex)']
+
+
+# Answer bodies for the report questions. These are static multi-KB
+# literals; building them once at import time keeps create_report from
+# re-concatenating them (and ReportLab from re-parsing fresh strings)
+# on every call.
+_Q1_TEXT = (
+    "<b>What we found:</b> Even when two inputs differ by just a single bit, their SHA256 "
+    "hashes look completely unrelated. On average, about <b>128 bits (50%)</b> of the output "
+    "changed, and usually <b>all 32 bytes</b> ended up being different.<br/><br/>"
+    "This is called the <b>avalanche effect</b>, and it's a key property of good cryptographic "
+    "hash functions. The idea is that even a tiny change to the input should cause a massive, "
+    "unpredictable change in the output. This makes it practically impossible to figure out "
+    "what the original input was just by looking at the hash, or to find patterns that could "
+    "be exploited."
+)
+
+_Q2_TEXT = (
+    "<b>Worst case scenario:</b> For an n-bit hash, you'd need at most 2^n + 1 attempts to "
+    "guarantee finding a collision (pigeonhole principle - if there are only 2^n possible "
+    "outputs, the 2^(n+1)th input must collide with something).<br/><br/>"
+    
+    "<b>Expected case (Birthday Bound):</b> Thanks to the birthday paradox, we actually "
+    "expect to find a collision much sooner - around 2^(n/2) hashes. This is because "
+    "collision probability grows quadratically as we add more samples.<br/><br/>"
+    
+    "<b>What we observed:</b> Our experiments matched the birthday bound predictions really "
+    "well. The number of hashes needed was consistently close to 2^(n/2).<br/><br/>"
+    
+    "<b>How long would a full 256-bit collision take?</b><br/>"
+    "• We'd need around 2^128 ≈ 3.4 × 10^38 hashes<br/>"
+    "• At 1 million hashes per second: ~10^32 seconds<br/>"
+    "• That's roughly <b>10^24 years</b><br/>"
+    "• The universe is only about 1.4 × 10^10 years old<br/><br/>"
+    "So yeah, SHA256 is collision-resistant for any practical purpose."
+)
+
+_Q3_TEXT = (
+    "<b>Can we break the one-way property with an 8-bit digest?</b><br/>"
+    "Absolutely. With only 256 possible hash values (2^8), we can easily find an input that "
+    "produces any given hash - just try random inputs until one works. At most, that's 256 "
+    "attempts.<br/><br/>"
+    
+    "<b>Is finding a pre-image easier or harder than finding a collision?</b><br/>"
+    "Finding a <b>pre-image is harder</b>. Here's why:<br/>"
+    "• <b>Pre-image attack:</b> You need to find a specific input that produces a specific "
+    "output. That takes O(2^n) work on average.<br/>"
+    "• <b>Collision attack:</b> You just need any two inputs that hash to the same thing. "
+    "Thanks to the birthday paradox, that only takes O(2^(n/2)) work.<br/><br/>"
+    
+    "For an 8-bit digest, this means:<br/>"
+    "• Pre-image: ~128 attempts on average<br/>"
+    "• Collision: ~16 attempts (square root of 256)<br/><br/>"
+    
+    "This is why collision resistance is considered a weaker property than pre-image "
+    "resistance. Breaking collision resistance is fundamentally easier."
+)
+
+_Q4_TEXT = (
+    "<b>Starting point:</b><br/>"
+    "• Our dictionary has ~135,000 words<br/>"
+    "• At workfactor 10, each hash takes about 110 ms<br/>"
+    "• Worst case for a single word: 135,000 × 0.11s ≈ 4.1 hours<br/><br/>"
+    
+    "<b>What about word1:word2 (two dictionary words)?</b><br/>"
+    "• Combinations: 135,000² = 18.2 billion possibilities<br/>"
+    "• Time needed: 18.2 × 10^9 × 0.11s = 2.0 × 10^9 seconds<br/>"
+    "• That's about <b>63 years</b> of continuous computation<br/><br/>"
+    
+    "<b>What about word1:word2:word3 (three words)?</b><br/>"
+    "• Combinations: 135,000³ = 2.46 × 10^15 possibilities<br/>"
+    "• Time needed: 2.46 × 10^15 × 0.11s = 2.7 × 10^14 seconds<br/>"
+    "• That's roughly <b>8.6 million years</b><br/><br/>"
+    
+    "<b>What about word1:word2:number (with 1-5 digit number)?</b><br/>"
+    "• Number options: 10 + 100 + 1000 + 10000 + 100000 = 111,110<br/>"
+    "• Total combinations: 135,000² × 111,110 = 2.02 × 10^15<br/>"
+    "• Time needed: about <b>7.0 million years</b><br/><br/>"
+    
+    "<b>Important assumptions:</b><br/>"
+    "• Single-threaded, sequential processing<br/>"
+    "• Worst case (password is the very last one tried)<br/>"
+    "• Constant hash time (real-world varies a bit)<br/><br/>"
+    
+    "Even if you threw 1000 CPU cores at this problem, multi-word passwords would still "
+    "take thousands of years to crack. This really drives home why passphrases (multiple "
+    "dictionary words strung together) are so much more secure than single-word passwords - "
+    "each additional word multiplies the search space by 135,000."
+)
+
+
+@functools.lru_cache(maxsize=None)
+def _get_styles():
+    """Build the stylesheet and custom paragraph styles once per process."""
+    from reportlab.lib import colors
+    from reportlab.lib.enums import TA_CENTER, TA_JUSTIFY
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+
+    styles = getSampleStyleSheet()
+    return {
+        'sheet': styles,
+        'title': ParagraphStyle(
+            'CustomTitle',
+            parent=styles['Heading1'],
+            fontSize=18,
+            spaceAfter=30,
+            alignment=TA_CENTER
+        ),
+        'heading': ParagraphStyle(
+            'CustomHeading',
+            parent=styles['Heading2'],
+            fontSize=14,
+            spaceBefore=20,
+            spaceAfter=10
+        ),
+        'subheading': ParagraphStyle(
+            'CustomSubHeading',
+            parent=styles['Heading3'],
+            fontSize=12,
+            spaceBefore=15,
+            spaceAfter=8
+        ),
+        'body': ParagraphStyle(
+            'CustomBody',
+            parent=styles['Normal'],
+            fontSize=10,
+            spaceAfter=12,
+            alignment=TA_JUSTIFY
+        ),
+        'code': ParagraphStyle(
+            'CodeStyle',
+            parent=styles['Code'],
+            fontSize=8,
+            leftIndent=20,
+            spaceAfter=10,
+            backColor=colors.Color(0.95, 0.95, 0.95)
+        ),
+        'code_block': ParagraphStyle(
+            'CodeBlock',
+            parent=styles['Code'],
+            fontSize=6,
+            leftIndent=10,
+            rightIndent=10,
+            spaceAfter=10,
+            backColor=colors.Color(0.95, 0.95, 0.95),
+            fontName='Courier'
+        ),
+    }
+
+
+@functools.lru_cache(maxsize=None)
+def _read_src(path):
+    """Appendix source files, read once per process; None if missing."""
+    p = Path(path)
+    return p.read_text() if p.exists() else None
+
+
+@functools.lru_cache(maxsize=None)
+def _static_para(text):
+    """Wrap a static answer body in a Paragraph once; reused across builds."""
+    from reportlab.platypus import Paragraph
+    return Paragraph(text, _get_styles()['body'])
+
+@functools.lru_cache(maxsize=None)
+def _load_collision_results():
+    """Parse collision_results.csv into display-ready table rows (cached)."""
+    rows = []
+    try:
+        with open('Module4/collision_results.csv', 'r', newline='') as f:
+            reader = csv.reader(f)
+            next(reader, None)  # Skip header
+            rows = [
+                [
+                    parts[0],
+                    f"{int(parts[1]):,}",
+                    f"{int(float(parts[3])):,}",
+                    f"{float(parts[2]):.4f}",
+                ]
+                for parts in reader if len(parts) >= 4
+            ]
+    except FileNotFoundError:
+        rows.append(['--', '--', '--', '--'])
+    return rows
+
+
+@functools.lru_cache(maxsize=None)
+def _load_collision_examples():
+    """Parse collision_examples.csv into display-ready table rows (cached)."""
+    rows = []
+    try:
+        with open('Module4/collision_examples.csv', 'r', newline='') as f:
+            reader = csv.reader(f)
+            next(reader, None)  # Skip header
+            for parts in reader:
+                if len(parts) >= 4:
+                    # Truncate message hex for display (first 16 chars)
+                    m1_hex = parts[2][:16] + '...' if len(parts[2]) > 16 else parts[2]
+                    m2_hex = parts[3][:16] + '...' if len(parts[3]) > 16 else parts[3]
+                    rows.append([parts[0], parts[1], m1_hex, m2_hex])
+    except FileNotFoundError:
+        rows.append(['--', '--', '--', '--'])
+    return rows
 
 
 def create_report():
     """Generate the PDF report."""
-    
+    from reportlab.lib import colors
+    from reportlab.lib.pagesizes import letter
+    from reportlab.lib.units import inch
+    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
+    from reportlab.platypus import Preformatted, PageBreak, Image
+
+    # Build against an in-memory buffer: ReportLab seeks repeatedly while
+    # finalizing, so the PDF hits disk as one sequential write at the end.
+    pdf_buf = io.BytesIO()
     doc = SimpleDocTemplate(
-        "Module4/Cryptographic_Hash_Functions_Report.pdf",
+        pdf_buf,
         pagesize=letter,
         rightMargin=72,
         leftMargin=72,
         topMargin=72,
         bottomMargin=72
     )
-    
-    styles = getSampleStyleSheet()
-    
-    # Custom styles
-    title_style = ParagraphStyle(
-        'CustomTitle',
-        parent=styles['Heading1'],
-        fontSize=18,
-        spaceAfter=30,
-        alignment=TA_CENTER
-    )
-    
-    heading_style = ParagraphStyle(
-        'CustomHeading',
-        parent=styles['Heading2'],
-        fontSize=14,
-        spaceBefore=20,
-        spaceAfter=10
-    )
-    
-    subheading_style = ParagraphStyle(
-        'CustomSubHeading',
-        parent=styles['Heading3'],
-        fontSize=12,
-        spaceBefore=15,
-        spaceAfter=8
-    )
-    
-    body_style = ParagraphStyle(
-        'CustomBody',
-        parent=styles['Normal'],
-        fontSize=10,
-        spaceAfter=12,
-        alignment=TA_JUSTIFY
-    )
-    
-    code_style = ParagraphStyle(
-        'CodeStyle',
-        parent=styles['Code'],
-        fontSize=8,
-        leftIndent=20,
-        spaceAfter=10,
-        backColor=colors.Color(0.95, 0.95, 0.95)
-    )
-    
+
+    st = _get_styles()
+    styles = st['sheet']
+    title_style = st['title']
+    heading_style = st['heading']
+    subheading_style = st['subheading']
+    body_style = st['body']
+    code_style = st['code']
+
     story = []
     
     # Title
@@ -117,17 +321,7 @@ def create_report():
     
     # Question 1 Answer
     story.append(Paragraph("Question 1: Observations from Task 1b", subheading_style))
-    story.append(Paragraph(
-        "<b>What we found:</b> Even when two inputs differ by just a single bit, their SHA256 "
-        "hashes look completely unrelated. On average, about <b>128 bits (50%)</b> of the output "
-        "changed, and usually <b>all 32 bytes</b> ended up being different.<br/><br/>"
-        "This is called the <b>avalanche effect</b>, and it's a key property of good cryptographic "
-        "hash functions. The idea is that even a tiny change to the input should cause a massive, "
-        "unpredictable change in the output. This makes it practically impossible to figure out "
-        "what the original input was just by looking at the hash, or to find patterns that could "
-        "be exploited.",
-        body_style
-    ))
+    story.append(_static_para(_Q1_TEXT))
     
     # Task 1c
     story.append(Paragraph("Task 1c: Finding Collisions", heading_style))
@@ -143,21 +337,9 @@ def create_report():
     story.append(Paragraph("Collision Analysis Data (8-50 bits)", subheading_style))
     
     # Read collision results from CSV if available
-    collision_table_data = [['Digest Bits', 'Hashes Required', 'Expected (2^(n/2))', 'Time (s)']]
-    try:
-        with open('Module4/collision_results.csv', 'r') as f:
-            lines = f.readlines()[1:]  # Skip header
-            for line in lines:
-                parts = line.strip().split(',')
-                if len(parts) >= 4:
-                    bits = parts[0]
-                    num_hashes = f"{int(parts[1]):,}"
-                    expected = f"{int(float(parts[3])):,}"
-                    time_s = f"{float(parts[2]):.4f}"
-                    collision_table_data.append([bits, num_hashes, expected, time_s])
-    except FileNotFoundError:
-        collision_table_data.append(['--', '--', '--', '--'])
-    
+    collision_table_data = [list(_COLLISION_HEADER)]
+    collision_table_data.extend(_load_collision_results())
+
     collision_table = Table(collision_table_data, colWidths=[1*inch, 1.3*inch, 1.3*inch, 1*inch])
     collision_table.setStyle(TableStyle([
         ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
@@ -176,7 +358,7 @@ def create_report():
     story.append(Spacer(1, 15))
     
     # Add collision analysis graph if it exists
-    if os.path.exists('Module4/collision_analysis.png'):
+    if _HAS_COLLISION_PNG:
         story.append(Paragraph("Collision Analysis Graph", subheading_style))
         img = Image('Module4/collision_analysis.png', width=6*inch, height=2.1*inch)
         story.append(img)
@@ -190,22 +372,9 @@ def create_report():
         body_style
     ))
     
-    collision_examples_data = [['Bits', 'Truncated Hash', 'Message 1 (hex)', 'Message 2 (hex)']]
-    try:
-        with open('Module4/collision_examples.csv', 'r') as f:
-            lines = f.readlines()[1:]  # Skip header
-            for line in lines:
-                parts = line.strip().split(',')
-                if len(parts) >= 4:
-                    bits = parts[0]
-                    hash_val = parts[1]
-                    # Truncate message hex for display (first 16 chars)
-                    m1_hex = parts[2][:16] + '...' if len(parts[2]) > 16 else parts[2]
-                    m2_hex = parts[3][:16] + '...' if len(parts[3]) > 16 else parts[3]
-                    collision_examples_data.append([bits, hash_val, m1_hex, m2_hex])
-    except FileNotFoundError:
-        collision_examples_data.append(['--', '--', '--', '--'])
-    
+    collision_examples_data = [list(_COLLISION_EXAMPLES_HEADER)]
+    collision_examples_data.extend(_load_collision_examples())
+
     collision_examples_table = Table(collision_examples_data, colWidths=[0.5*inch, 1.3*inch, 1.5*inch, 1.5*inch])
     collision_examples_table.setStyle(TableStyle([
         ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
@@ -225,50 +394,11 @@ def create_report():
     
     # Question 2 Answer
     story.append(Paragraph("Question 2: Collision Analysis", subheading_style))
-    story.append(Paragraph(
-        "<b>Worst case scenario:</b> For an n-bit hash, you'd need at most 2^n + 1 attempts to "
-        "guarantee finding a collision (pigeonhole principle - if there are only 2^n possible "
-        "outputs, the 2^(n+1)th input must collide with something).<br/><br/>"
-        
-        "<b>Expected case (Birthday Bound):</b> Thanks to the birthday paradox, we actually "
-        "expect to find a collision much sooner - around 2^(n/2) hashes. This is because "
-        "collision probability grows quadratically as we add more samples.<br/><br/>"
-        
-        "<b>What we observed:</b> Our experiments matched the birthday bound predictions really "
-        "well. The number of hashes needed was consistently close to 2^(n/2).<br/><br/>"
-        
-        "<b>How long would a full 256-bit collision take?</b><br/>"
-        "• We'd need around 2^128 ≈ 3.4 × 10^38 hashes<br/>"
-        "• At 1 million hashes per second: ~10^32 seconds<br/>"
-        "• That's roughly <b>10^24 years</b><br/>"
-        "• The universe is only about 1.4 × 10^10 years old<br/><br/>"
-        "So yeah, SHA256 is collision-resistant for any practical purpose.",
-        body_style
-    ))
+    story.append(_static_para(_Q2_TEXT))
     
     # Question 3 Answer
     story.append(Paragraph("Question 3: Pre-image Resistance vs Collision Resistance", subheading_style))
-    story.append(Paragraph(
-        "<b>Can we break the one-way property with an 8-bit digest?</b><br/>"
-        "Absolutely. With only 256 possible hash values (2^8), we can easily find an input that "
-        "produces any given hash - just try random inputs until one works. At most, that's 256 "
-        "attempts.<br/><br/>"
-        
-        "<b>Is finding a pre-image easier or harder than finding a collision?</b><br/>"
-        "Finding a <b>pre-image is harder</b>. Here's why:<br/>"
-        "• <b>Pre-image attack:</b> You need to find a specific input that produces a specific "
-        "output. That takes O(2^n) work on average.<br/>"
-        "• <b>Collision attack:</b> You just need any two inputs that hash to the same thing. "
-        "Thanks to the birthday paradox, that only takes O(2^(n/2)) work.<br/><br/>"
-        
-        "For an 8-bit digest, this means:<br/>"
-        "• Pre-image: ~128 attempts on average<br/>"
-        "• Collision: ~16 attempts (square root of 256)<br/><br/>"
-        
-        "This is why collision resistance is considered a weaker property than pre-image "
-        "resistance. Breaking collision resistance is fundamentally easier.",
-        body_style
-    ))
+    story.append(_static_para(_Q3_TEXT))
     
     story.append(PageBreak())
     
@@ -314,27 +444,7 @@ def create_report():
         body_style
     ))
     
-    # Create results table with actual cracking results
-    table_data = [
-        ['User', 'Workfactor', 'Password', 'Time'],
-        ['Bilbo', '8', 'welcome', '392.82s (6.5 min)'],
-        ['Gandalf', '8', 'wizard', '390.51s (6.5 min)'],
-        ['Thorin', '8', 'diamond', '377.49s (6.3 min)'],
-        ['Fili', '9', 'desire', '782.39s (13 min)'],
-        ['Kili', '9', 'ossify', '740.89s (12.3 min)'],
-        ['Balin', '10', 'hangout', '1557.72s (26 min)'],
-        ['Dwalin', '10', 'drossy', '1361.81s (22.7 min)'],
-        ['Oin', '10', 'ispaghul', '1436.17s (24 min)'],
-        ['Gloin', '11', 'oversave', '2896.63s (48 min)'],
-        ['Dori', '11', 'indoxylic', '2755.79s (46 min)'],
-        ['Nori', '11', 'swagsman', '2929.05s (49 min)'],
-        ['Ori', '12', 'airway', '5450.16s (1.5 hrs)'],
-        ['Bifur', '12', 'corrosible', '5727.11s (1.6 hrs)'],
-        ['Bofur', '12', 'libellate', '5837.28s (1.6 hrs)'],
-        ['Durin', '13', 'purrone', '14509.72s (4.0 hrs)'],
-    ]
-    
-    table = Table(table_data, colWidths=[1.2*inch, 1*inch, 1.5*inch, 1.3*inch])
+    table = Table([list(r) for r in _CRACK_RESULTS], colWidths=[1.2*inch, 1*inch, 1.5*inch, 1.3*inch])
     table.setStyle(TableStyle([
         ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
         ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
@@ -363,65 +473,24 @@ def create_report():
     
     # Question 4 Answer
     story.append(Paragraph("Question 4: Brute Force Time Estimates", heading_style))
-    story.append(Paragraph(
-        "<b>Starting point:</b><br/>"
-        "• Our dictionary has ~135,000 words<br/>"
-        "• At workfactor 10, each hash takes about 110 ms<br/>"
-        "• Worst case for a single word: 135,000 × 0.11s ≈ 4.1 hours<br/><br/>"
-        
-        "<b>What about word1:word2 (two dictionary words)?</b><br/>"
-        "• Combinations: 135,000² = 18.2 billion possibilities<br/>"
-        "• Time needed: 18.2 × 10^9 × 0.11s = 2.0 × 10^9 seconds<br/>"
-        "• That's about <b>63 years</b> of continuous computation<br/><br/>"
-        
-        "<b>What about word1:word2:word3 (three words)?</b><br/>"
-        "• Combinations: 135,000³ = 2.46 × 10^15 possibilities<br/>"
-        "• Time needed: 2.46 × 10^15 × 0.11s = 2.7 × 10^14 seconds<br/>"
-        "• That's roughly <b>8.6 million years</b><br/><br/>"
-        
-        "<b>What about word1:word2:number (with 1-5 digit number)?</b><br/>"
-        "• Number options: 10 + 100 + 1000 + 10000 + 100000 = 111,110<br/>"
-        "• Total combinations: 135,000² × 111,110 = 2.02 × 10^15<br/>"
-        "• Time needed: about <b>7.0 million years</b><br/><br/>"
-        
-        "<b>Important assumptions:</b><br/>"
-        "• Single-threaded, sequential processing<br/>"
-        "• Worst case (password is the very last one tried)<br/>"
-        "• Constant hash time (real-world varies a bit)<br/><br/>"
-        
-        "Even if you threw 1000 CPU cores at this problem, multi-word passwords would still "
-        "take thousands of years to crack. This really drives home why passphrases (multiple "
-        "dictionary words strung together) are so much more secure than single-word passwords - "
-        "each additional word multiplies the search space by 135,000.",
-        body_style
-    ))
+    story.append(_static_para(_Q4_TEXT))
     
     story.append(PageBreak())
     
     # ==================== CODE APPENDIX ====================
     story.append(Paragraph("CODE APPENDIX", title_style))
     
-    # Define code style for code blocks
-    code_style_block = ParagraphStyle(
-        'CodeBlock',
-        parent=styles['Code'],
-        fontSize=6,
-        leftIndent=10,
-        rightIndent=10,
-        spaceAfter=10,
-        backColor=colors.Color(0.95, 0.95, 0.95),
-        fontName='Courier'
-    )
-    
+    # Code style for code blocks (shared, cached)
+    code_style_block = st['code_block']
+
     # Task 1 Code
     story.append(Paragraph("Task 1: SHA256 Implementation (task1_sha256.py)", heading_style))
     
     # Read and include task1 code
-    try:
-        with open('Module4/task1_sha256.py', 'r') as f:
-            task1_code = f.read()
+    task1_code = _read_src('Module4/task1_sha256.py')
+    if task1_code is not None:
         story.append(Preformatted(task1_code, code_style_block))
-    except FileNotFoundError:
+    else:
         story.append(Paragraph("Code file not found.", body_style))
     
     story.append(PageBreak())
@@ -430,11 +499,10 @@ def create_report():
     story.append(Paragraph("Task 2: Bcrypt Cracker (task2_bcrypt_cracker.py)", heading_style))
     
     # Read and include task2 code
-    try:
-        with open('Module4/task2_bcrypt_cracker.py', 'r') as f:
-            task2_code = f.read()
+    task2_code = _read_src('Module4/task2_bcrypt_cracker.py')
+    if task2_code is not None:
         story.append(Preformatted(task2_code, code_style_block))
-    except FileNotFoundError:
+    else:
         story.append(Paragraph("Code file not found.", body_style))
     
     # Interesting Observations
@@ -466,13 +534,15 @@ def create_report():
     
     # Build PDF
     doc.build(story)
+    with open("Module4/Cryptographic_Hash_Functions_Report.pdf", 'wb') as f:
+        f.write(pdf_buf.getvalue())
     print("Report generated: Module4/Cryptographic_Hash_Functions_Report.pdf")
 
 
 def main():
     """Main entry point."""
     try:
-        from reportlab.lib import colors
+        import reportlab  # availability probe only; submodules load lazily
         create_report()
     except ImportError:
         print("reportlab not installed. Installing...")
@@ -12,12 +12,17 @@ Usage:
     python task2_bcrypt_cracker.py --parallel   # Use all CPU cores
     python task2_bcrypt_cracker.py --parallel 8 # Use 8 CPU cores
     python task2_bcrypt_cracker.py --parallel --background  # Parallel + background
+    python task2_bcrypt_cracker.py --hashcat    # Offload to hashcat if installed
     
     # To run in background and keep running after terminal closes:
     nohup python task2_bcrypt_cracker.py --parallel --background &
 """
 
 import bcrypt
+try:
+    from fast_bcrypt import hashpw as _hashpw  # native crypt_rn when available
+except ImportError:
+    _hashpw = bcrypt.hashpw
 import time
 import multiprocessing
 from typing import Optional, Tuple, List, Dict, Any
@@ -33,22 +38,33 @@ class Logger:
     def __init__(self, log_file: str = None):
         self.log_file = log_file
         self.file_handle = None
+        # Progress file handle kept open for the whole run (set in main)
+        # so each cracked password is one write, not an open/close pair
+        self.progress_fh = None
         if log_file:
-            self.file_handle = open(log_file, 'a')
+            # Line-buffered: each newline reaches the kernel without an
+            # explicit flush() call per message
+            self.file_handle = open(log_file, 'a', buffering=1)
             
-    def log(self, message: str, flush: bool = True):
-        """Log message to console and file."""
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    def log(self, message: str, flush: bool = False):
+        """Log message to console and file.
+
+        Flushing is opt-in: progress chatter inside the cracking loops can
+        stay buffered, state transitions (passwords found, run summary)
+        pass flush=True.
+        """
+        timestamp = time.strftime("%Y-%m-%d %H:%M:%S")
         formatted = f"[{timestamp}] {message}"
         print(formatted, flush=flush)
         if self.file_handle:
             self.file_handle.write(formatted + "\n")
-            if flush:
-                self.file_handle.flush()
     
     def close(self):
         if self.file_handle:
             self.file_handle.close()
+        if self.progress_fh:
+            self.progress_fh.close()
+            self.progress_fh = None
 
 
 # Global logger instance
@@ -57,9 +73,14 @@ logger = Logger()
 
 def save_progress(user: str, password: str, time_taken: float, attempts: int, workfactor: int):
     """Save a cracked password immediately to progress file."""
-    with open('Module4/cracking_progress.txt', 'a') as f:
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        f.write(f"[{timestamp}] {user}: {password} (time: {time_taken:.2f}s, attempts: {attempts}, wf: {workfactor})\n")
+    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    line = f"[{timestamp}] {user}: {password} (time: {time_taken:.2f}s, attempts: {attempts}, wf: {workfactor})\n"
+    if logger.progress_fh is not None:
+        logger.progress_fh.write(line)
+        logger.progress_fh.flush()
+    else:
+        with open('Module4/cracking_progress.txt', 'a') as f:
+            f.write(line)
 
 
 # Shadow file content (from provided PDF)
@@ -115,7 +136,7 @@ def parse_shadow_entry(line: str) -> Optional[Dict[str, Any]]:
     # The salt for bcrypt.hashpw needs to include the prefix
     # Format: $2b$<workfactor>$<22-char-salt>
     bcrypt_salt = f"${algorithm}${hash_parts[2]}${salt}"
-    
+
     return {
         'user': user,
         'algorithm': algorithm,
@@ -123,19 +144,36 @@ def parse_shadow_entry(line: str) -> Optional[Dict[str, Any]]:
         'salt': salt,
         'bcrypt_salt': bcrypt_salt,
         'hash': hash_value,
-        'full_hash': full_hash
+        'full_hash': full_hash,
+        # Pre-encoded once so the hot cracking loops never call .encode()
+        'bcrypt_salt_b': bcrypt_salt.encode('ascii'),
+        'full_hash_b': full_hash.encode('ascii')
     }
 
 
-def get_nltk_words(min_length: int = 6, max_length: int = 10) -> List[str]:
+# Candidates worth trying first given the Tolkien-themed usernames
+THEMED_WORDS = [
+    'gandalf', 'mithril', 'durins', 'erebor', 'smaug', 'hobbit', 'bilbo',
+    'thorin', 'shire', 'moria', 'gondor', 'mordor', 'arkenstone', 'oakenshield',
+    'baggins', 'tolkien', 'wizard', 'dragon', 'dwarves', 'password', 'letmein',
+    'welcome', 'monkey', 'sunshine', 'princess', 'qwerty',
+]
+
+
+def get_nltk_words(min_length: int = 6, max_length: int = 10) -> List[bytes]:
     """
     Get words from NLTK corpus filtered by length.
-    Returns words between min_length and max_length (inclusive).
+    Returns pre-encoded bytes (bcrypt input is bytes, and encoding once here
+    avoids millions of per-candidate .encode() calls in the cracking loops)
+    for words between min_length and max_length (inclusive), ordered by
+    English frequency (most common first) when wordfreq is available so
+    likelier passwords are tried sooner; a small themed dictionary is
+    spliced in at the front.
     """
     try:
         import nltk
         from nltk.corpus import words
-        
+
         # Download words corpus if not present
         try:
             word_list = words.words()
@@ -143,192 +181,276 @@ def get_nltk_words(min_length: int = 6, max_length: int = 10) -> List[str]:
             print("Downloading NLTK words corpus...")
             nltk.download('words', quiet=True)
             word_list = words.words()
-        
-        # Filter by length and convert to lowercase
-        filtered_words = [
-            w.lower() for w in word_list 
-            if min_length <= len(w) <= max_length
-        ]
-        
-        # Remove duplicates and sort
-        filtered_words = sorted(list(set(filtered_words)))
-        
+
+        # Filter by length and convert to lowercase; drop non-ASCII and
+        # non-alphabetic entries — they cannot be these passwords and each
+        # one skipped is a full bcrypt hash (per salt) saved
+        total_in_range = 0
+        filtered_words = []
+        for w in word_list:
+            if min_length <= len(w) <= max_length:
+                total_in_range += 1
+                if w.isascii() and w.isalpha():
+                    filtered_words.append(w.lower())
+        dropped = total_in_range - len(filtered_words)
+        if dropped:
+            print(f"Filtered out {dropped:,} non-ASCII/non-alphabetic words")
+
+        # Insertion-order dedup in one pass (dict.fromkeys) — cheaper than
+        # sorted(set(...)) and only one sort follows: by descending
+        # frequency with alphabetic tie-break, or plain alphabetic when
+        # wordfreq is not installed
+        filtered_words = list(dict.fromkeys(filtered_words))
+        try:
+            from wordfreq import word_frequency
+            filtered_words.sort(key=lambda w: (-word_frequency(w, 'en'), w))
+        except ImportError:
+            filtered_words.sort()
+
+        # Try the themed candidates first
+        themed = [w for w in THEMED_WORDS if min_length <= len(w) <= max_length]
+        themed_set = set(themed)
+        filtered_words = themed + [w for w in filtered_words if w not in themed_set]
+
         print(f"Loaded {len(filtered_words):,} words from NLTK corpus "
               f"(length {min_length}-{max_length})")
-        
-        return filtered_words
-    
+
+        return [w.encode('utf-8') for w in filtered_words]
+
     except ImportError:
         print("NLTK not installed. Please install with: pip install nltk")
         raise
 
 
-def check_password_hashpw(password: str, bcrypt_salt: str, expected_hash: str) -> bool:
+def check_password_hashpw(word_b: bytes, bcrypt_salt_b: bytes, expected_hash_b: bytes) -> bool:
     """
     Check if a password matches using hashpw method.
-    
+
     Args:
-        password: Plaintext password to test
-        bcrypt_salt: The 29-character salt (e.g., $2b$08$J9FW66ZdPI2nrIMcOxFYI.)
-        expected_hash: The full hash to compare against
-    
+        word_b: Pre-encoded plaintext password to test
+        bcrypt_salt_b: The 29-byte salt (e.g., $2b$08$J9FW66ZdPI2nrIMcOxFYI.)
+        expected_hash_b: The full hash to compare against
+
     Returns:
         True if password matches, False otherwise
     """
     try:
-        computed_hash = bcrypt.hashpw(password.encode('utf-8'), bcrypt_salt.encode('utf-8'))
-        return computed_hash.decode('utf-8') == expected_hash
+        return _hashpw(word_b, bcrypt_salt_b) == expected_hash_b
     except Exception:
         return False
 
 
-def check_password_checkpw(password: str, full_hash: str) -> bool:
+def check_password_checkpw(word_b: bytes, full_hash_b: bytes) -> bool:
     """
-    Check if a password matches using checkpw method.
-    
-    Args:
-        password: Plaintext password to test
-        full_hash: The full bcrypt hash
-    
+    Check if a password matches against a full bcrypt hash.
+
+    Both arguments are pre-encoded bytes so the cracking loops never pay
+    per-candidate encode/decode churn.
+
     Returns:
         True if password matches, False otherwise
     """
     try:
-        return bcrypt.checkpw(password.encode('utf-8'), full_hash.encode('utf-8'))
+        # First 29 bytes ($2b$NN$ + 22-char salt) are the hashing setting
+        return _hashpw(word_b, full_hash_b[:29]) == full_hash_b
     except Exception:
         return False
 
 
-def crack_single_user(user: str, full_hash: str, word_list: List[str], 
+def batch_bcrypt_check(word_b: bytes, salts: List[bytes], hashes: List[bytes]) -> List[int]:
+    """
+    Check one candidate word against many hashes with one bcrypt call per
+    unique salt.
+
+    In the provided shadow file every user within a workfactor group shares
+    the same salt, so hashing the candidate once covers the whole group —
+    comparing the result against each user's hash is just a byte compare.
+
+    Returns:
+        List of indices into salts/hashes that matched.
+    """
+    computed: Dict[bytes, bytes] = {}
+    hits = []
+    for idx, (salt, expected) in enumerate(zip(salts, hashes)):
+        h = computed.get(salt)
+        if h is None:
+            try:
+                h = _hashpw(word_b, salt)
+            except Exception:
+                h = b''
+            computed[salt] = h
+        if h == expected:
+            hits.append(idx)
+    return hits
+
+
+def crack_single_user(user: str, full_hash: str, word_list: List[bytes],
                       progress_interval: int = 5000) -> Optional[Tuple[str, float, int]]:
     """
     Crack a single user's password.
-    
+
     Returns:
         Tuple of (password, time_taken, attempts) if found, None otherwise
     """
     start_time = time.time()
-    
+    full_hash_b = full_hash.encode('utf-8')
+
     for i, word in enumerate(word_list):
         if i > 0 and i % progress_interval == 0:
             elapsed = time.time() - start_time
             rate = i / elapsed if elapsed > 0 else 0
             print(f"    [{user}] Tried {i:,} words ({rate:.1f} words/sec)...")
-        
-        if check_password_checkpw(word, full_hash):
+
+        if check_password_checkpw(word, full_hash_b):
             elapsed = time.time() - start_time
-            return (word, elapsed, i + 1)
-    
+            return (word.decode('utf-8'), elapsed, i + 1)
+
     return None
 
 
-def crack_worker_chunk(args):
-    """Worker function for parallel cracking. Checks a chunk of words against a hash."""
-    word_chunk, full_hash, start_index = args
-    for i, word in enumerate(word_chunk):
-        try:
-            if bcrypt.checkpw(word.encode('utf-8'), full_hash.encode('utf-8')):
-                return (word, start_index + i)
-        except:
-            pass
-    return None
+# Shared with pool workers: stop event so they abandon work after a hit.
+# The word list and the struct-of-arrays view of the shadow entries live in
+# module globals that reach forked workers via copy-on-write inheritance, so
+# task tuples only ever carry small index ranges.
+_stop_event = None
+WORDS: List[bytes] = []
+USERS: List[str] = []
+SALTS: List[bytes] = []
+HASHES: List[bytes] = []
 
 
-def crack_user_parallel(user: str, full_hash: str, word_list: List[str], 
-                        num_processes: int) -> Optional[Tuple[str, float, int]]:
-    """Crack a single user's password using multiple processes."""
-    from multiprocessing import Pool
-    
-    # Split word list into chunks for each process
-    chunk_size = len(word_list) // num_processes
-    if chunk_size == 0:
-        chunk_size = 1
-    
-    args_list = []
-    for i in range(num_processes):
-        start = i * chunk_size
-        end = start + chunk_size if i < num_processes - 1 else len(word_list)
-        if start < len(word_list):
-            args_list.append((word_list[start:end], full_hash, start))
-    
-    start_time = time.time()
-    
-    with Pool(processes=num_processes) as pool:
-        results = pool.map(crack_worker_chunk, args_list)
-    
-    # Check results from all processes
-    for result in results:
-        if result is not None:
-            password, word_idx = result
-            elapsed = time.time() - start_time
-            return (password, elapsed, word_idx + 1)
-    
-    return None
+def _init_worker(stop_event):
+    """Pool initializer: stash the shared stop event in the worker process."""
+    global _stop_event
+    _stop_event = stop_event
 
 
-def crack_by_workfactor_group_parallel(entries: List[Dict], word_list: List[str], 
+def crack_group_worker_chunk(args):
+    """
+    Worker function for group cracking. Checks a range of words against all
+    users in a workfactor group, sharing one bcrypt call per salt. Users are
+    referenced by index into the fork-inherited SALTS/HASHES arrays.
+
+    Returns:
+        List of (user_index, word_index) hits found in the range.
+    """
+    start, end, user_idxs = args
+    salts = [SALTS[j] for j in user_idxs]
+    hashes = [HASHES[j] for j in user_idxs]
+    hits = []
+    for i in range(start, end):
+        if _stop_event is not None and _stop_event.is_set():
+            break
+        for k in batch_bcrypt_check(WORDS[i], salts, hashes):
+            hits.append((user_idxs[k], i))
+    return hits
+
+
+def crack_by_workfactor_group_parallel(entries: List[Dict], word_list: List[bytes], 
                                         num_processes: int = None) -> List[Dict[str, Any]]:
     """
     Crack passwords using multiple CPU cores.
     """
     import multiprocessing as mp
-    
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+
     if num_processes is None:
         num_processes = mp.cpu_count()
-    
+
     results = []
-    
-    # Group by workfactor
-    workfactor_groups: Dict[int, List[Dict]] = {}
-    for entry in entries:
+
+    # Group by workfactor, tracking entries by index into the SoA arrays
+    workfactor_groups: Dict[int, List[int]] = {}
+    for i, entry in enumerate(entries):
         wf = entry['workfactor']
         if wf not in workfactor_groups:
             workfactor_groups[wf] = []
-        workfactor_groups[wf].append(entry)
-    
-    # Process each workfactor group
-    for workfactor in sorted(workfactor_groups.keys()):
-        group = workfactor_groups[workfactor]
-        logger.log(f"\n{'='*70}")
-        logger.log(f"CRACKING WORKFACTOR {workfactor} ({len(group)} users) - {num_processes} cores")
-        logger.log(f"{'='*70}")
-        
-        start_time = time.time()
-        
-        # For each user, try to crack in parallel
-        for entry in group:
-            user = entry['user']
-            logger.log(f"  Cracking {user}...")
-            
-            result = crack_user_parallel(user, entry['full_hash'], word_list, num_processes)
-            
-            if result is not None:
-                password, elapsed, attempts = result
-                logger.log(f"  [+] FOUND: {user}'s password is '{password}' "
-                      f"(Time: {elapsed:.2f}s, Word index: {attempts:,})")
-                results.append({
-                    'user': user,
-                    'password': password,
-                    'time': elapsed,
-                    'attempts': attempts,
-                    'workfactor': workfactor
-                })
-                save_progress(user, password, elapsed, attempts, workfactor)
-            else:
-                elapsed = time.time() - start_time
-                logger.log(f"  [-] NOT FOUND: {user}'s password")
-                results.append({
-                    'user': user,
-                    'password': None,
-                    'time': elapsed,
-                    'attempts': len(word_list),
-                    'workfactor': workfactor
-                })
-    
+        workfactor_groups[wf].append(i)
+
+    # One pool for the whole run: workers fork once and inherit the word
+    # list and entry arrays through module globals instead of re-pickling
+    # them for every chunk
+    global WORDS, USERS, SALTS, HASHES
+    WORDS = word_list
+    USERS = [e['user'] for e in entries]
+    SALTS = [e['bcrypt_salt_b'] for e in entries]
+    HASHES = [e['full_hash_b'] for e in entries]
+    stop_event = mp.Event()
+    executor = ProcessPoolExecutor(max_workers=num_processes,
+                                   mp_context=mp.get_context('fork'),
+                                   initializer=_init_worker,
+                                   initargs=(stop_event,))
+
+    try:
+        # Process each workfactor group
+        for workfactor in sorted(workfactor_groups.keys()):
+            group = workfactor_groups[workfactor]
+            logger.log(f"\n{'='*70}")
+            logger.log(f"CRACKING WORKFACTOR {workfactor} ({len(group)} users) - {num_processes} cores")
+            logger.log(f"{'='*70}")
+
+            start_time = time.time()
+
+            # Parallelize over word ranges, each worker checking all users in
+            # the group: with few users per workfactor this keeps every core
+            # busy, unlike cracking one user at a time
+            chunk_size = words_per_chunk(workfactor)
+            args_list = []
+            for start in range(0, len(word_list), chunk_size):
+                end = min(start + chunk_size, len(word_list))
+                args_list.append((start, end, group))
+
+            found: Dict[int, Tuple[str, float, int]] = {}
+            futures = [executor.submit(crack_group_worker_chunk, args)
+                       for args in args_list]
+            for fut in as_completed(futures):
+                if fut.cancelled():
+                    continue
+                for j, word_idx in fut.result():
+                    if j in found:
+                        continue
+                    word = word_list[word_idx].decode('utf-8')
+                    elapsed = time.time() - start_time
+                    found[j] = (word, elapsed, word_idx + 1)
+                    logger.log(f"  [+] FOUND: {USERS[j]}'s password is '{word}' "
+                          f"(Time: {elapsed:.2f}s, Word index: {word_idx+1:,})", flush=True)
+                    save_progress(USERS[j], word, elapsed, word_idx + 1,
+                                  workfactor)
+                if len(found) == len(group):
+                    # Whole group cracked: cancel queued chunks outright and
+                    # let the in-flight ones bail out via the event
+                    stop_event.set()
+                    for f in futures:
+                        f.cancel()
+            stop_event.clear()
+
+            for j in group:
+                if j in found:
+                    password, elapsed, attempts = found[j]
+                    results.append({
+                        'user': USERS[j],
+                        'password': password,
+                        'time': elapsed,
+                        'attempts': attempts,
+                        'workfactor': workfactor
+                    })
+                else:
+                    elapsed = time.time() - start_time
+                    logger.log(f"  [-] NOT FOUND: {USERS[j]}'s password", flush=True)
+                    results.append({
+                        'user': USERS[j],
+                        'password': None,
+                        'time': elapsed,
+                        'attempts': len(word_list),
+                        'workfactor': workfactor
+                    })
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
     return results
 
 
-def crack_by_workfactor_group(entries: List[Dict], word_list: List[str]) -> List[Dict[str, Any]]:
+def crack_by_workfactor_group(entries: List[Dict], word_list: List[bytes]) -> List[Dict[str, Any]]:
     """
     Crack passwords grouped by workfactor for efficiency.
     Users with the same workfactor and salt can be checked together.
@@ -350,49 +472,75 @@ def crack_by_workfactor_group(entries: List[Dict], word_list: List[str]) -> List
         logger.log(f"CRACKING WORKFACTOR {workfactor} ({len(group)} users)")
         logger.log(f"{'='*70}")
         
-        # Track which users still need to be cracked
-        remaining = {e['user']: e for e in group}
-        
+        # Track which users still need to be cracked (parallel lists so one
+        # bcrypt call per unique salt covers every user sharing that salt)
+        remaining = list(group)
+        hashes = [e['full_hash_b'] for e in remaining]
+
         start_time = time.time()
-        
-        for i, word in enumerate(word_list):
+
+        # Words are processed in blocks in salt-major order: the whole block
+        # is hashed against one salt before touching the next, keeping the
+        # per-salt Blowfish working set cache-hot instead of alternating
+        # salts on every word
+        block_size = 128
+
+        for block_start in range(0, len(word_list), block_size):
             if not remaining:
                 break
-                
-            if i > 0 and i % 5000 == 0:
+
+            if block_start > 0 and block_start // 5000 != (block_start - block_size) // 5000:
                 elapsed = time.time() - start_time
-                rate = i / elapsed if elapsed > 0 else 0
-                logger.log(f"  Tried {i:,} words ({rate:.1f} words/sec), "
+                rate = block_start / elapsed if elapsed > 0 else 0
+                logger.log(f"  Tried {block_start:,} words ({rate:.1f} words/sec), "
                       f"{len(remaining)} users remaining...")
-            
-            # Check this word against all remaining users in the group
-            found_users = []
-            for user, entry in remaining.items():
-                if check_password_checkpw(word, entry['full_hash']):
-                    elapsed = time.time() - start_time
-                    logger.log(f"  [+] FOUND: {user}'s password is '{word}' "
-                          f"(Time: {elapsed:.2f}s, Attempt: {i+1:,})")
-                    results.append({
-                        'user': user,
-                        'password': word,
-                        'time': elapsed,
-                        'attempts': i + 1,
-                        'workfactor': workfactor
-                    })
-                    # Save progress immediately
-                    save_progress(user, word, elapsed, i + 1, workfactor)
-                    found_users.append(user)
-            
+
+            block_b = word_list[block_start:block_start + block_size]
+
+            by_salt: Dict[bytes, List[int]] = {}
+            for j, entry in enumerate(remaining):
+                by_salt.setdefault(entry['bcrypt_salt_b'], []).append(j)
+
+            found_idx = set()
+            for salt, user_idxs in by_salt.items():
+                for k, word_b in enumerate(block_b):
+                    try:
+                        h = _hashpw(word_b, salt)
+                    except Exception:
+                        continue
+                    for j in user_idxs:
+                        if j in found_idx or h != hashes[j]:
+                            continue
+                        user = remaining[j]['user']
+                        word = block_b[k].decode('utf-8')
+                        attempts = block_start + k + 1
+                        elapsed = time.time() - start_time
+                        logger.log(f"  [+] FOUND: {user}'s password is '{word}' "
+                              f"(Time: {elapsed:.2f}s, Attempt: {attempts:,})", flush=True)
+                        results.append({
+                            'user': user,
+                            'password': word,
+                            'time': elapsed,
+                            'attempts': attempts,
+                            'workfactor': workfactor
+                        })
+                        # Save progress immediately
+                        save_progress(user, word, elapsed, attempts, workfactor)
+                        found_idx.add(j)
+                    if all(j in found_idx for j in user_idxs):
+                        break
+
             # Remove found users from remaining
-            for user in found_users:
-                del remaining[user]
-        
+            if found_idx:
+                remaining = [e for j, e in enumerate(remaining) if j not in found_idx]
+                hashes = [e['full_hash_b'] for e in remaining]
+
         # Mark any remaining users as not found
-        for user, entry in remaining.items():
+        for entry in remaining:
             elapsed = time.time() - start_time
-            logger.log(f"  [-] NOT FOUND: {user}'s password (exhausted word list)")
+            logger.log(f"  [-] NOT FOUND: {entry['user']}'s password (exhausted word list)", flush=True)
             results.append({
-                'user': user,
+                'user': entry['user'],
                 'password': None,
                 'time': elapsed,
                 'attempts': len(word_list),
@@ -442,40 +590,145 @@ def estimate_time(workfactor: int, num_words: int) -> float:
     return total_seconds
 
 
-def verify_test_vector():
-    """Verify the implementation with the provided test vector."""
+def words_per_chunk(workfactor: int, target_seconds: float = 2.0) -> int:
+    """
+    Pick a parallel chunk size worth roughly target_seconds of hashing at
+    this workfactor. Fine-grained chunks let idle workers steal work and
+    keep the wasted tail after a hit short, while still amortizing dispatch
+    overhead over a couple of seconds of bcrypt work.
+    """
+    time_per_hash = estimate_time(workfactor, 1)
+    return max(1, int(target_seconds / time_per_hash))
+
+
+def crack_with_hashcat(entries: List[Dict], word_list: List[bytes]) -> Optional[List[Dict[str, Any]]]:
+    """
+    Offload the whole batch to hashcat (-m 3200 is bcrypt) when it is
+    installed — a mature GPU/OpenCL implementation beats any CPU loop at
+    workfactors 12-13. Returns results in the usual shape, or None when
+    hashcat is not on PATH so the caller falls back to the built-in
+    cracker. hashcat does not report per-hash attempt counts, so attempts
+    is 0 for cracked entries.
+    """
+    import shutil
+    import subprocess
+    import tempfile
+
+    if shutil.which('hashcat') is None:
+        logger.log("hashcat not found on PATH; using the built-in cracker", flush=True)
+        return None
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        hashes_path = os.path.join(tmpdir, 'hashes.txt')
+        words_path = os.path.join(tmpdir, 'words.txt')
+        out_path = os.path.join(tmpdir, 'cracked.txt')
+
+        with open(hashes_path, 'w') as f:
+            for entry in entries:
+                f.write(entry['full_hash'] + '\n')
+        with open(words_path, 'wb') as f:
+            f.write(b'\n'.join(word_list) + b'\n')
+
+        logger.log(f"Running hashcat on {len(entries)} hashes...", flush=True)
+        start_time = time.time()
+        subprocess.run(
+            ['hashcat', '-m', '3200', '-a', '0', hashes_path, words_path,
+             '--quiet', '--potfile-disable', '--outfile', out_path],
+            check=False
+        )
+        total_time = time.time() - start_time
+
+        cracked = {}
+        if os.path.exists(out_path):
+            with open(out_path) as f:
+                for line in f:
+                    line = line.strip()
+                    if line:
+                        full_hash, _, password = line.rpartition(':')
+                        cracked[full_hash] = password
+
+    results = []
+    for entry in entries:
+        password = cracked.get(entry['full_hash'])
+        results.append({
+            'user': entry['user'],
+            'password': password,
+            'time': total_time,
+            'attempts': 0 if password else len(word_list),
+            'workfactor': entry['workfactor']
+        })
+        if password:
+            save_progress(entry['user'], password, total_time, 0, entry['workfactor'])
+    return results
+
+
+# Sentinel recording a successful test-vector check; valid while newer
+# than this script so a code change forces re-verification
+_VERIFY_SENTINEL = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.verify_ok')
+
+
+def verify_test_vector(use_cache: bool = True):
+    """Verify the implementation with the provided test vector.
+
+    The check costs a full workfactor-8 hash, so a passing result is cached
+    in a sentinel file and skipped on later runs until the script changes.
+    """
+    if use_cache:
+        try:
+            if os.path.getmtime(_VERIFY_SENTINEL) >= os.path.getmtime(os.path.abspath(__file__)):
+                print("Test vector previously verified (cached).")
+                return True
+        except OSError:
+            pass
+
     print("Verifying test vector...")
-    
+
     # From the assignment hints
-    result = bcrypt.hashpw(b"registrationsucks", b"$2b$08$J9FW66ZdPI2nrIMcOxFYI.")
+    result = _hashpw(b"registrationsucks", b"$2b$08$J9FW66ZdPI2nrIMcOxFYI.")
     expected = b'$2b$08$J9FW66ZdPI2nrIMcOxFYI.zKGJsUXmWLAYWsNmIANUy5JbSjfyLFu'
-    
+
     print(f"  Input: 'registrationsucks'")
     print(f"  Salt:  '$2b$08$J9FW66ZdPI2nrIMcOxFYI.'")
     print(f"  Result:   {result}")
     print(f"  Expected: {expected}")
     print(f"  Match: {result == expected}")
-    
+
+    if result == expected:
+        with open(_VERIFY_SENTINEL, 'w'):
+            pass
+
     return result == expected
 
 
-def main(background_mode: bool = False, parallel: int = 0):
+def main(background_mode: bool = False, parallel: int = 0, use_hashcat: bool = False):
     """Main function to crack bcrypt passwords.
     
     Args:
         background_mode: If True, log to file
         parallel: Number of CPU cores to use (0 = single-threaded)
+        use_hashcat: Try offloading to hashcat first (falls back if absent)
     """
     global logger
-    
+
+    # Fork-inheritance lets workers see the parent's word list without
+    # pickling; this is the Linux default but make it explicit
+    if parallel > 0:
+        try:
+            multiprocessing.set_start_method('fork')
+        except RuntimeError:
+            pass
+
     # Set up logging
     if background_mode:
         log_file = f"Module4/cracking_log_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt"
         logger = Logger(log_file)
         logger.log(f"Background mode enabled. Logging to: {log_file}")
-        # Clear progress file
-        with open('Module4/cracking_progress.txt', 'w') as f:
-            f.write(f"=== Password Cracking Started: {datetime.now()} ===\n\n")
+        # Clear progress file; the handle stays open for the whole run
+        logger.progress_fh = open('Module4/cracking_progress.txt', 'w')
+        logger.progress_fh.write(f"=== Password Cracking Started: {datetime.now()} ===\n\n")
+        logger.progress_fh.flush()
+    else:
+        logger.progress_fh = open('Module4/cracking_progress.txt', 'a')
     
     logger.log("=" * 70)
     logger.log("TASK 2: BCRYPT PASSWORD CRACKER")
@@ -524,10 +777,14 @@ def main(background_mode: bool = False, parallel: int = 0):
     logger.log("=" * 70)
     
     total_start = time.time()
-    if parallel > 0:
-        results = crack_by_workfactor_group_parallel(entries, word_list, parallel)
-    else:
-        results = crack_by_workfactor_group(entries, word_list)
+    results = None
+    if use_hashcat:
+        results = crack_with_hashcat(entries, word_list)
+    if results is None:
+        if parallel > 0:
+            results = crack_by_workfactor_group_parallel(entries, word_list, parallel)
+        else:
+            results = crack_by_workfactor_group(entries, word_list)
     total_time = time.time() - total_start
     
     # Summary
@@ -605,6 +862,7 @@ if __name__ == "__main__":
     else:
         # Parse arguments
         background = '--background' in sys.argv
+        use_hashcat = '--hashcat' in sys.argv
         parallel = 0
         
         if '--parallel' in sys.argv:
@@ -615,4 +873,4 @@ if __name__ == "__main__":
             else:
                 parallel = multiprocessing.cpu_count()
         
-        main(background_mode=background, parallel=parallel)
+        main(background_mode=background, parallel=parallel, use_hashcat=use_hashcat)